@@ -1,4 +1,5 @@
-import time
+import logging
+import os
 import cv2 as cv
 import numpy as np
 from modules.camera import Camera
@@ -10,20 +11,39 @@ from modules.drawing import (
     FREE_DRAW,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class VirtualCanvas:
     ESC_KEY = 27
     FRAME_DELAY = 1
-
-    def __init__(self):
-        self.camera = Camera(height=720, width=1280)
+    CANVAS_ALPHA = 0.5  # Opacity of the board over the live video
+    CAMERA_CPU = 0  # Default core reserved for the camera capture thread
+
+    def __init__(self, camera_cpu=CAMERA_CPU):
+        # Pinning only pays off with a core to spare; None disables it
+        self.camera_cpu = camera_cpu
+        if len(self.get_available_cpus()) < 2:
+            self.camera_cpu = None
+        camera_cpus = None if self.camera_cpu is None else {self.camera_cpu}
+
+        self.camera = Camera(
+            height=720,
+            width=1280,
+            mirror=True,
+            cpu_affinity=camera_cpus,
+        )
         self.tracker = HandTracker()
         self.menu = None
 
         # Canvas properties
         self.canvas = None
+        self.ink_mask = None  # 255 wherever a stroke may be on the canvas
         self.canvas_size = None
         self.canvas_origin = None
+        self.canvas_region = None
+        self._canvas_dirty = False
+        self._ink_rect = None  # (x0, y0, x1, y1) bounding all strokes
 
         # Drawing state
         self.current_color = COLORS[0]  # Start with red
@@ -31,6 +51,7 @@ class VirtualCanvas:
         self.current_tool = FREE_DRAW
         self.is_drawing = False
         self.prev_pos = None
+        self.stroke_points = []  # Pen samples not yet rasterized
 
         # UI state
         self.show_canvas = False
@@ -41,7 +62,7 @@ class VirtualCanvas:
     def initialize(self):
         """Initialize camera and UI components."""
         self.camera.start()
-        self.wait_for_camera()
+        self.pin_main_thread()
 
         try:
             self.wait_for_camera()
@@ -52,19 +73,31 @@ class VirtualCanvas:
         self.setup_menu()
         self.setup_canvas()
 
+    def get_available_cpus(self):
+        """Return the CPUs this process may run on (Linux only)."""
+        if not hasattr(os, "sched_getaffinity"):
+            return set()
+        return os.sched_getaffinity(0)
+
+    def pin_main_thread(self):
+        """Keep the main loop off the camera core (Linux only).
+
+        Threads started later from the main thread, such as OpenCV's
+        worker pool, inherit this mask and also stay off that core.
+        """
+        if self.camera_cpu is None or not hasattr(os, "sched_setaffinity"):
+            return
+
+        cpus = os.sched_getaffinity(0) - {self.camera_cpu}
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+
     def wait_for_camera(self):
         """Wait until the camera is ready."""
         TIMEOUT = 5  # seconds
-        start_time = time.time()
 
         print("Waiting for camera to initialize...")
-        while (
-            self.camera.get_immediate_frame() is None
-            and (time.time() - start_time) < TIMEOUT
-        ):
-            time.sleep(0.1)
-
-        if self.camera.get_immediate_frame() is None:
+        if not self.camera.wait_for_first_frame(TIMEOUT):
             raise RuntimeError("Camera initialization timed out.")
 
     def setup_canvas(self):
@@ -79,8 +112,15 @@ class VirtualCanvas:
         )
 
         height, width = self.canvas_size
-        self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
-        self.canvas[:] = WHITE  # White background
+        canvas_y, canvas_x = self.canvas_origin
+        self.canvas_region = (
+            slice(canvas_y, canvas_y + height),
+            slice(canvas_x, canvas_x + width),
+        )
+
+        self.canvas = np.empty((height, width, 3), dtype=np.uint8)
+        self.ink_mask = np.empty((height, width), dtype=np.uint8)
+        self.reset_canvas()
 
     def setup_menu(self):
         """Initialize the menu with proper positioning."""
@@ -99,15 +139,14 @@ class VirtualCanvas:
         )
 
         self.menu = Menu(board_toggle_pos, pen_toggle_pos)
-        self.menu.create_buttons()
 
     def process_frame(self):
         """Process each frame for drawing and UI interaction."""
         frame = self.camera.get_frame()
         if frame is None:
-            return False
+            # The camera stalled; keep the window responsive and retry
+            return cv.waitKey(self.FRAME_DELAY) != self.ESC_KEY
 
-        frame = cv.flip(frame, 1)
         processed_frame = self.tracker.process_frame(frame)
 
         index_pos, will_draw = self.get_finger_info(processed_frame)
@@ -118,6 +157,8 @@ class VirtualCanvas:
         if self.tracker.is_drawing_mode and will_draw:
             self.handle_drawing(index_pos, processed_frame)
 
+        self.flush_stroke()
+
         self.handle_ui_interaction(index_pos, processed_frame)
 
         if self.show_canvas:
@@ -138,24 +179,97 @@ class VirtualCanvas:
 
     def blend_canvas_onto_frame(self, frame):
         """Blend the canvas onto the live video frame."""
-        canvas_y, canvas_x = self.canvas_origin
+        # The region is a view into frame, so blending into it with dst
+        # writes the result in place without a temporary image.
+        frame_region = frame[self.canvas_region]
+        self.refresh_ink_rect()
+
+        # OpenCV already spreads each blend call over its own threads
+        self.blend_stripe(frame_region, 0, frame_region.shape[0])
+
+    def blend_stripe(self, frame_region, top, bottom):
+        """Blend a band of rows, reading the canvas only inside the ink."""
+        if self._ink_rect is None:
+            self.blend_white(frame_region[top:bottom])
+            return
+
+        x0, y0, x1, y1 = self._ink_rect
+        ink_top, ink_bottom = max(top, y0), min(bottom, y1)
+        if ink_top >= ink_bottom:
+            self.blend_white(frame_region[top:bottom])
+            return
+
+        # Everything outside the ink rect is still the white background
+        ink_rows = slice(ink_top, ink_bottom)
+        self.blend_white(frame_region[top:ink_top])
+        self.blend_white(frame_region[ink_bottom:bottom])
+        self.blend_white(frame_region[ink_rows, :x0])
+        self.blend_white(frame_region[ink_rows, x1:])
+
+        frame_ink = frame_region[ink_rows, x0:x1]
+        cv.addWeighted(
+            frame_ink,
+            1 - self.CANVAS_ALPHA,
+            self.canvas[ink_rows, x0:x1],
+            self.CANVAS_ALPHA,
+            0,
+            dst=frame_ink,
+        )
+
+    def blend_white(self, frame_part):
+        """Blend the blank white board into a frame view."""
+        if frame_part.size == 0:
+            return
+
+        # Same result as addWeighted against WHITE, without reading it
+        cv.convertScaleAbs(
+            frame_part,
+            dst=frame_part,
+            alpha=1 - self.CANVAS_ALPHA,
+            beta=255 * self.CANVAS_ALPHA,
+        )
+
+    def refresh_ink_rect(self):
+        """Shrink the ink rect to the remaining strokes after erasing."""
+        if not self._canvas_dirty:
+            return
+
+        x0, y0, x1, y1 = self._ink_rect
+        x, y, w, h = cv.boundingRect(self.ink_mask[y0:y1, x0:x1])
+        self._ink_rect = (
+            (x0 + x, y0 + y, x0 + x + w, y0 + y + h) if w else None
+        )
+        self._canvas_dirty = False
+
+    def expand_ink_rect(self, points, margin):
+        """Grow the ink rect to cover points drawn with the given margin."""
+        x, y, w, h = cv.boundingRect(points)
         height, width = self.canvas_size
+        rect = (
+            max(x - margin, 0),
+            max(y - margin, 0),
+            min(x + w + margin, width),
+            min(y + h + margin, height),
+        )
 
-        frame_region = frame[
-            canvas_y : canvas_y + height, canvas_x : canvas_x + width
-        ]
-        blended = cv.addWeighted(frame_region, 0.5, self.canvas, 0.5, 0)
-        frame[
-            canvas_y : canvas_y + height, canvas_x : canvas_x + width
-        ] = blended
+        if self._ink_rect is not None:
+            rect = (
+                min(rect[0], self._ink_rect[0]),
+                min(rect[1], self._ink_rect[1]),
+                max(rect[2], self._ink_rect[2]),
+                max(rect[3], self._ink_rect[3]),
+            )
+
+        self._ink_rect = rect
 
     def handle_drawing(self, finger_pos, frame):
         """Handle drawing operations on the canvas."""
         if not self.show_canvas or not finger_pos:
             return
 
-        canvas_x = finger_pos[0] - self.canvas_origin[1]
-        canvas_y = finger_pos[1] - self.canvas_origin[0]
+        origin_y, origin_x = self.canvas_origin
+        canvas_x = finger_pos[0] - origin_x
+        canvas_y = finger_pos[1] - origin_y
 
         if not self.is_within_canvas(canvas_x, canvas_y):
             self.prev_pos = None
@@ -165,35 +279,47 @@ class VirtualCanvas:
 
     def is_within_canvas(self, canvas_x, canvas_y):
         """Check if the canvas_x and canvas_y are within canvas bounds."""
-        return (
-            0 <= canvas_x < self.canvas_size[1]
-            and 0 <= canvas_y < self.canvas_size[0]
-        )
+        height, width = self.canvas_size
+        return 0 <= canvas_x < width and 0 <= canvas_y < height
 
     def draw_on_canvas(self, canvas_x, canvas_y):
-        """Draw or erase on the canvas at the given canvas coordinates."""
+        """Erase at, or queue a pen sample for, the given canvas point."""
+        point = (canvas_x, canvas_y)
+        brush_size = self.brush_size
+
         if self.prev_pos is None:
-            self.prev_pos = (canvas_x, canvas_y)
+            self.prev_pos = point
 
         if self.is_eraser:
-            cv.circle(
-                self.canvas,
-                (canvas_x, canvas_y),
-                self.brush_size * 2,
-                WHITE,
-                -1,
-            )
+            eraser_radius = brush_size * 2
+            cv.circle(self.canvas, point, eraser_radius, WHITE, -1)
+            cv.circle(self.ink_mask, point, eraser_radius, 0, -1)
+            # Erasing may have shrunk the ink, so re-measure it lazily.
+            self._canvas_dirty = self._ink_rect is not None
 
         if not self.is_eraser:
-            cv.line(
+            if not self.stroke_points:
+                self.stroke_points.append(self.prev_pos)
+            self.stroke_points.append(point)
+
+        self.prev_pos = point
+
+    def flush_stroke(self):
+        """Rasterize the pen samples gathered this frame in one call."""
+        if len(self.stroke_points) > 1:
+            points = np.array(self.stroke_points, dtype=np.int32)
+            cv.polylines(
                 self.canvas,
-                self.prev_pos,
-                (canvas_x, canvas_y),
+                [points],
+                False,
                 self.current_color,
                 self.brush_size,
             )
+            cv.polylines(self.ink_mask, [points], False, 255, self.brush_size)
+            self.expand_ink_rect(points, self.brush_size)
 
-        self.prev_pos = (canvas_x, canvas_y)
+        # The next frame continues the stroke from prev_pos
+        self.stroke_points = []
 
     def handle_ui_interaction(self, finger_pos, frame):
         """Handle interactions with UI buttons."""
@@ -205,9 +331,8 @@ class VirtualCanvas:
             finger_pos=finger_pos, is_clicking=self.tracker.detect_click()
         )
 
-        print(f"Clicked button: {clicked_button}")
-
         if clicked_button:
+            logger.debug("Clicked button: %s", clicked_button.label)
             self.handle_button_action(clicked_button)
 
         # Draw UI elements
@@ -256,7 +381,15 @@ class VirtualCanvas:
     def clear_canvas(self, button):
         """Clear the entire canvas when the clear button is pressed."""
         if button == self.menu.clear_button:
-            self.canvas[:] = WHITE
+            self.reset_canvas()
+
+    def reset_canvas(self):
+        """Fill the canvas with its white background."""
+        # WHITE is 255 in every channel, so a single memset clears it
+        self.canvas.fill(255)
+        self.ink_mask.fill(0)
+        self._canvas_dirty = False
+        self._ink_rect = None
 
     def run(self):
         """Main application loop."""
@@ -1,3 +1,4 @@
+import os
 import cv2
 import threading
 
@@ -5,17 +6,25 @@ class Camera:
     """
     Camera class for initialization, frame handling, and cleanup.
     Supports optional background frame capture using threading.
+
+    Background capture uses three reusable frame buffers: the capture
+    thread writes into one, the newest complete frame waits in another,
+    and the caller owns the third until its next get_frame call.
     """
 
     DEFAULT_CAMERA_INDEX = 0
     DEFAULT_WIDTH = 640
     DEFAULT_HEIGHT = 480
+    DRIVER_BUFFER_SIZE = 1
+    FRAME_TIMEOUT = 1.0  # seconds
 
     def __init__(
         self,
         camera_index=DEFAULT_CAMERA_INDEX,
         width=DEFAULT_WIDTH,
-        height=DEFAULT_HEIGHT
+        height=DEFAULT_HEIGHT,
+        mirror=False,
+        cpu_affinity=None
     ):
         """
         Initialize the camera with specified parameters.
@@ -24,17 +33,30 @@ class Camera:
             camera_index (int): Index of the camera (default: 0).
             width (int): Desired frame width in pixels (default: 640).
             height (int): Desired frame height in pixels (default: 480).
+            mirror (bool): Flip frames horizontally; background frames are
+                flipped on the capture thread (default: False).
+            cpu_affinity (set[int] | None): CPUs to pin the capture thread
+                to, where the OS supports it (default: None, no pinning).
         """
         self.camera_index = camera_index
         self.width = width
         self.height = height
+        self.mirror = mirror
+        self.cpu_affinity = cpu_affinity
         self.cap = None
 
         # Threading-related attributes
-        self.latest_frame = None
+        self.buffers = [None, None, None]
+        self.write_index = 0
+        self.ready_index = 1
+        self.read_index = 2
+        self.raw_frame = None
+        self.has_new_frame = False
         self.is_running = False
         self.capture_thread = None
         self.frame_lock = threading.Lock()
+        self.frame_ready = threading.Condition(self.frame_lock)
+        self.first_frame_event = threading.Event()
 
     def open(self):
         """Open the camera and set frame properties.
@@ -51,26 +73,65 @@ class Camera:
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
 
+        # Keep a single driver-side frame so reads never return stale ones
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.DRIVER_BUFFER_SIZE)
+
     def update_frame(self):
         """Continuously capture frames in a background thread."""
+        self.pin_capture_thread()
+
         while self.is_running:
             self.capture_single_frame()
 
+    def pin_capture_thread(self):
+        """Pin the calling thread to cpu_affinity (Linux only)."""
+        if self.cpu_affinity is None or not hasattr(os, "sched_setaffinity"):
+            return
+
+        # On Linux, pid 0 targets the calling thread rather than the process
+        cpus = set(self.cpu_affinity) & os.sched_getaffinity(0)
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+
     def capture_single_frame(self):
         """Capture a single frame (helper for _update_frame)."""
         if self.cap is None or not self.cap.isOpened():
             return
 
-        ret, frame = self.cap.read()
-        if not ret:
+        # grab() takes the newest frame without decoding it; retrieve()
+        # then decodes it into the write buffer once its size is known
+        if not self.cap.grab():
             return
 
-        with self.frame_lock:
-            self.latest_frame = frame
+        if self.mirror:
+            ret, self.raw_frame = self.cap.retrieve(self.raw_frame)
+            if not ret:
+                return
+
+            # Mirror straight into the write buffer instead of the consumer
+            frame = cv2.flip(self.raw_frame, 1, self.buffers[self.write_index])
+        else:
+            ret, frame = self.cap.retrieve(self.buffers[self.write_index])
+            if not ret:
+                return
+
+        self.buffers[self.write_index] = frame
+
+        # Only the buffer indices are swapped under the lock, never pixels
+        with self.frame_ready:
+            self.write_index, self.ready_index = (
+                self.ready_index,
+                self.write_index,
+            )
+            self.has_new_frame = True
+            self.frame_ready.notify()
+
+        self.first_frame_event.set()
 
     def start(self):
         """Start background frame capture."""
         self.open()
+        self.first_frame_event.clear()
         self.is_running = True
         self.capture_thread = threading.Thread(
             target=self.update_frame,
@@ -78,6 +139,17 @@ class Camera:
         )
         self.capture_thread.start()
 
+    def wait_for_first_frame(self, timeout=None):
+        """Block until background capture has produced its first frame.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait (default: None).
+
+        Returns:
+            bool: True if a frame arrived, False if the wait timed out.
+        """
+        return self.first_frame_event.wait(timeout)
+
     def get_frame(self):
         """
         Get the latest frame captured by the background thread if running,
@@ -89,12 +161,30 @@ class Camera:
         return self.get_immediate_frame()
 
     def get_latest_frame(self):
-        """Get the latest frame from background thread."""
-        with self.frame_lock:
-            if self.latest_frame is None:
-                raise RuntimeError("No frame available yet.")
-            
-            return self.latest_frame.copy()
+        """Get the latest frame from background thread.
+
+        Waits for a frame newer than the previous call, so a caller drawing
+        on the result never receives the same buffer twice. The buffer is
+        not copied; it stays untouched by the capture thread until the
+        next call to this method.
+
+        Returns:
+            numpy.ndarray | None: The frame, or None if no new frame
+            arrived within FRAME_TIMEOUT, e.g. while the camera stalls.
+        """
+        with self.frame_ready:
+            if not self.frame_ready.wait_for(
+                lambda: self.has_new_frame, timeout=self.FRAME_TIMEOUT
+            ):
+                return None
+
+            self.read_index, self.ready_index = (
+                self.ready_index,
+                self.read_index,
+            )
+            self.has_new_frame = False
+
+            return self.buffers[self.read_index]
 
     def get_immediate_frame(self):
         """Capture and return an immediate single frame."""
@@ -104,7 +194,10 @@ class Camera:
         ret, frame = self.cap.read()
         if not ret:
             raise RuntimeError("Failed to read frame from camera.")
-        
+
+        if self.mirror:
+            cv2.flip(frame, 1, frame)
+
         return frame
 
     def stop(self):
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2 as cv
 import numpy as np
 
@@ -16,21 +18,31 @@ class Filter:
         [0, -1, 0],
         [-1, 5, -1],
         [0, -1, 0]
-    ])
+    ], dtype=np.float32)
 
     CANNY_LOW_THRESHOLD = 100
     CANNY_HIGH_THRESHOLD = 200
 
     SOBEL_KSIZE = 3
-    SOBEL_DDEPTH = cv.CV_64F
+    SOBEL_DDEPTH = cv.CV_32F
     SOBEL_DX = 1
     SOBEL_DY = 1
     SOBEL_ZERO = 0
 
     LAPLACIAN_DDEPTH = cv.CV_64F
 
-    def __init__(self):
-        """Initializes the filter settings and kernel parameters."""
+    MULTI_WORKERS = 3
+    MULTI_PREFIX = "multi_"
+
+    def __init__(self, use_gpu=False):
+        """Initializes the filter settings and kernel parameters.
+
+        With use_gpu, frames are uploaded as cv.UMat so that OpenCV runs
+        the filters through OpenCL, when a device is available and
+        OpenCL is enabled. Enabling it with cv.ocl.setUseOpenCL is left
+        to the application, since it affects every cv call in the
+        process. Results are still returned as NumPy arrays.
+        """
         # Blur settings
         self.gaussian_ksize = self.GAUSSIAN_KSIZE
         self.gaussian_sigmaX = self.GAUSSIAN_SIGMA_X
@@ -56,49 +68,164 @@ class Filter:
         # Laplacian setting
         self.laplacian_ddepth = self.LAPLACIAN_DDEPTH
 
+        # OpenCL backend, only if the process already has it enabled
+        self.use_gpu = use_gpu and cv.ocl.haveOpenCL() and cv.ocl.useOpenCL()
+
+        # Scratch buffers reused between calls, keyed by name
+        self.buffers = {}
+
+        # Edge filters that apply_multi can run side by side on one gray
+        self.edge_filters = {
+            "edge_detection": self.detect_canny_edges,
+            "laplacian": self.detect_laplacian_edges,
+            "sobel": self.detect_sobel_edges,
+        }
+
+        # Worker threads for apply_multi, started on its first call
+        self.pool = None
+
+    def get_buffer(self, name, shape, dtype=np.uint8):
+        """Return the named scratch buffer, reallocating on shape change.
+
+        Returns None on the GPU, where OpenCV pools device buffers itself.
+        """
+        if self.use_gpu:
+            return None
+
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            self.buffers[name] = buffer
+        return buffer
+
+    def to_device(self, frame):
+        """Uploads the frame to the GPU when it is enabled."""
+        return cv.UMat(frame) if self.use_gpu else frame
+
+    def to_host(self, result):
+        """Downloads a GPU result back into a NumPy array."""
+        return result.get() if isinstance(result, cv.UMat) else result
+
     def apply_gaussian_blur(self, frame):
         """Applies Gaussian Blur to the input frame."""
-        return cv.GaussianBlur(frame, self.gaussian_ksize, self.gaussian_sigmaX)
+        return self.to_host(
+            cv.GaussianBlur(
+                self.to_device(frame),
+                self.gaussian_ksize,
+                self.gaussian_sigmaX,
+            )
+        )
 
     def apply_median_blur(self, frame):
         """Applies Median Blur to reduce noise."""
-        return cv.medianBlur(frame, self.median_ksize)
+        return self.to_host(
+            cv.medianBlur(self.to_device(frame), self.median_ksize)
+        )
 
     def apply_bilateral_filter(self, frame):
         """Applies Bilateral Filtering to smooth image and keep edges."""
-        return cv.bilateralFilter(
-            frame,
-            self.bilateral_d,
-            self.bilateral_sigmaColor,
-            self.bilateral_sigmaSpace,
+        return self.to_host(
+            cv.bilateralFilter(
+                self.to_device(frame),
+                self.bilateral_d,
+                self.bilateral_sigmaColor,
+                self.bilateral_sigmaSpace,
+            )
         )
 
     def apply_sharpening(self, frame):
         """Applies a sharpening filter using a convolution kernel."""
-        return cv.filter2D(frame, -1, self.sharpen_kernel)
+        return self.to_host(
+            cv.filter2D(self.to_device(frame), -1, self.sharpen_kernel)
+        )
+
+    def to_gray(self, frame, prefix=""):
+        """Converts the frame to grayscale in the prefixed gray buffer."""
+        gray = self.get_buffer(prefix + "gray", frame.shape[:2])
+        return cv.cvtColor(
+            self.to_device(frame), cv.COLOR_BGR2GRAY, dst=gray
+        )
+
+    def to_bgr(self, image):
+        """Converts a single-channel result to a new BGR frame.
+
+        Only scratch buffers are reused, so callers may keep the result.
+        """
+        return self.to_host(cv.cvtColor(image, cv.COLOR_GRAY2BGR))
 
     def apply_edge_detection(self, frame):
         """Applies Canny edge detection and converts result to BGR."""
-        gray = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
-        edges = cv.Canny(gray, self.canny_low, self.canny_high)
-        return cv.cvtColor(edges, cv.COLOR_GRAY2BGR)
+        shape = frame.shape[:2]
+        edges = self.detect_canny_edges(self.to_gray(frame), shape)
+        return self.to_bgr(edges)
 
     def apply_laplacian(self, frame):
         """Applies the Laplacian operator for edge detection."""
-        gray = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
-        lap = cv.Laplacian(gray, self.laplacian_ddepth)
-        lap = cv.convertScaleAbs(lap)
-        return cv.cvtColor(lap, cv.COLOR_GRAY2BGR)
+        shape = frame.shape[:2]
+        edges = self.detect_laplacian_edges(self.to_gray(frame), shape)
+        return self.to_bgr(edges)
 
     def apply_sobel(self, frame):
         """Applies Sobel edge detection and returns combined magnitude."""
-        gray = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+        shape = frame.shape[:2]
+        edges = self.detect_sobel_edges(self.to_gray(frame), shape)
+        return self.to_bgr(edges)
+
+    def apply_multi(self, frame, names):
+        """Applies several edge filters concurrently to one frame.
+
+        The frame is converted to gray once and each named filter
+        ("edge_detection", "laplacian", "sobel") runs on its own pool
+        thread; OpenCV releases the GIL while it works. Returns a dict of
+        BGR results keyed by name.
+        """
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.MULTI_WORKERS)
+
+        # Multi runs keep their own scratch buffers, apart from the ones
+        # used by the single-filter methods
+        shape = frame.shape[:2]
+        gray = self.to_gray(frame, self.MULTI_PREFIX)
+
+        futures = {
+            name: self.pool.submit(self._run_edge_filter, name, gray, shape)
+            for name in names
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+    def _run_edge_filter(self, name, gray, shape):
+        """Runs one named edge filter on a gray image, into its own buffers."""
+        edges = self.edge_filters[name](gray, shape, self.MULTI_PREFIX)
+        return self.to_bgr(edges)
+
+    def detect_canny_edges(self, gray, shape, prefix=""):
+        """Returns the Canny edge map of a gray image."""
+        return cv.Canny(
+            gray,
+            self.canny_low,
+            self.canny_high,
+            self.get_buffer(prefix + "canny_edges", shape),
+        )
 
+    def detect_laplacian_edges(self, gray, shape, prefix=""):
+        """Returns the absolute Laplacian of a gray image as 8-bit."""
+        lap = cv.Laplacian(
+            gray,
+            self.laplacian_ddepth,
+            self.get_buffer(prefix + "laplacian", shape, np.float64),
+        )
+        return cv.convertScaleAbs(
+            lap, self.get_buffer(prefix + "laplacian_edges", shape)
+        )
+
+    def detect_sobel_edges(self, gray, shape, prefix=""):
+        """Returns the 8-bit Sobel gradient magnitude of a gray image."""
         sobel_x = cv.Sobel(
             gray,
             self.sobel_ddepth,
             self.sobel_dx,
             self.sobel_zero,
+            self.get_buffer(prefix + "sobel_x", shape, np.float32),
             ksize=self.sobel_ksize,
         )
 
@@ -107,9 +234,18 @@ class Filter:
             self.sobel_ddepth,
             self.sobel_zero,
             self.sobel_dy,
+            self.get_buffer(prefix + "sobel_y", shape, np.float32),
             ksize=self.sobel_ksize,
         )
 
-        magnitude = cv.magnitude(sobel_x, sobel_y)
-        magnitude = cv.convertScaleAbs(magnitude)
-        return cv.cvtColor(magnitude, cv.COLOR_GRAY2BGR)
+        # The magnitude overwrites sobel_x, which is no longer needed
+        magnitude = cv.magnitude(sobel_x, sobel_y, sobel_x)
+        return cv.convertScaleAbs(
+            magnitude, self.get_buffer(prefix + "sobel_edges", shape)
+        )
+
+    def close(self):
+        """Shuts down the apply_multi worker threads, if started."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
@@ -28,19 +28,39 @@ class HandTracker:
         MIDDLE_FINGER_KEY: {"MCP": 9, "PIP": 10, "DIP": 11, "TIP": 12},
     }
 
+    # Landmark indices from fingertip down to knuckle, for the raised check
+    JOINT_CHAIN = ("TIP", "DIP", "PIP", "MCP")
+    INDEX_FINGER_CHAIN = tuple(
+        map(FINGER_LANDMARKS[INDEX_FINGER_KEY].get, JOINT_CHAIN)
+    )
+    MIDDLE_FINGER_CHAIN = tuple(
+        map(FINGER_LANDMARKS[MIDDLE_FINGER_KEY].get, JOINT_CHAIN)
+    )
+
     def __init__(
         self,
         use_static_image_mode=False,
         max_num_hands=2,
         detection_conf=0.8,
         tracking_conf=0.85,
+        model_complexity=0,
+        detection_scale=0.5,
+        detection_interval=2,
     ):
-        """Initialize the hand tracker with MediaPipe Hands settings."""
+        """Initialize the hand tracker with MediaPipe Hands settings.
+
+        Landmarks are detected on a copy of the frame resized by
+        detection_scale. While a hand is tracked, only every
+        detection_interval-th frame is detected and the frames in between
+        reuse the previous landmarks; without a hand, every frame is.
+        model_complexity 0 selects MediaPipe's faster lite landmark model.
+        """
         self.hand_detector = mp.solutions.hands.Hands(
             static_image_mode=use_static_image_mode,
             max_num_hands=max_num_hands,
             min_detection_confidence=detection_conf,
             min_tracking_confidence=tracking_conf,
+            model_complexity=model_complexity,
         )
 
         self.prev_index_up = False
@@ -48,13 +68,26 @@ class HandTracker:
 
         self.is_clicked_prev = False
 
+        self.detection_scale = detection_scale
+        self.detection_interval = detection_interval
+        self.frame_count = 0
+
+        # Detection-size scratch frames, reused while the frame size holds
+        self.small_frame = None
+        self.rgb_frame = None
+
         self.hand_landmarks = None
         self.is_drawing_mode = False
         self.draw_modes = []
 
     def process_frame(self, image_bgr):
         """Process a frame and return it with drawn landmarks."""
-        self.update_landmarks(image_bgr)
+        # Skipping frames only pays off once a hand has been found
+        is_detection_frame = self.frame_count % self.detection_interval == 0
+        if is_detection_frame or not self.has_landmarks():
+            self.update_landmarks(image_bgr)
+        self.frame_count += 1
+
         if self.hand_landmarks and self.hand_landmarks.multi_hand_landmarks:
             self.draw_raised_fingers(image_bgr)
 
@@ -80,10 +113,41 @@ class HandTracker:
 
     def update_landmarks(self, image_bgr):
         """Update hand landmarks from the current frame."""
-        image_rgb = cv.cvtColor(image_bgr, cv.COLOR_BGR2RGB)
-        self.hand_landmarks = self.hand_detector.process(image_rgb)
+        # Landmarks are normalized, so detecting on a smaller copy of the
+        # frame needs no rescaling afterwards
+        self.ensure_detection_buffers(image_bgr.shape)
+        height, width = self.small_frame.shape[:2]
+
+        cv.resize(
+            image_bgr,
+            (width, height),
+            dst=self.small_frame,
+            interpolation=cv.INTER_AREA,
+        )
+        self.rgb_frame.flags.writeable = True
+        cv.cvtColor(self.small_frame, cv.COLOR_BGR2RGB, dst=self.rgb_frame)
+
+        # A read-only image is passed to MediaPipe by reference, not copied
+        self.rgb_frame.flags.writeable = False
+        self.hand_landmarks = self.hand_detector.process(self.rgb_frame)
         self.hand_classifications = self.hand_landmarks.multi_handedness or []
 
+    def ensure_detection_buffers(self, frame_shape):
+        """Allocate the resize and RGB scratch frames for this frame size."""
+        height, width = frame_shape[:2]
+        small_shape = (
+            round(height * self.detection_scale),
+            round(width * self.detection_scale),
+            3,
+        )
+
+        small_frame = self.small_frame
+        if small_frame is not None and small_frame.shape == small_shape:
+            return
+
+        self.small_frame = np.empty(small_shape, dtype=np.uint8)
+        self.rgb_frame = np.empty(small_shape, dtype=np.uint8)
+
     def has_landmarks(self):
         """Check if valid landmarks exist."""
         return self.hand_landmarks and self.hand_landmarks.multi_hand_landmarks
@@ -125,10 +189,7 @@ class HandTracker:
         """Check if the drawing mode is active based on raised fingers."""
         self.draw_modes.clear()
 
-        for fingers in raised_fingers:
-            index_up = fingers.get(self.INDEX_FINGER_KEY)
-            middle_up = fingers.get(self.MIDDLE_FINGER_KEY)
-
+        for index_up, middle_up in raised_fingers:
             is_drawing = index_up and not middle_up
             self.draw_modes.append(is_drawing)
 
@@ -140,8 +201,10 @@ class HandTracker:
         is_draw_mode,
     ):
         """Draw tips for raised fingers of a single hand."""
-        for finger_name, joint_names in self.FINGER_LANDMARKS.items():
-            if raised_fingers.get(finger_name):
+        for (finger_name, joint_names), is_raised in zip(
+            self.FINGER_LANDMARKS.items(), raised_fingers
+        ):
+            if is_raised:
                 tip = landmark.landmark[joint_names["TIP"]]
                 x_coord, y_coord = self.normalize_coordinates(
                     tip, image_bgr.shape
@@ -181,24 +244,23 @@ class HandTracker:
         ]
 
     def check_hand_fingers(self, hand_landmark):
-        """Check which fingers are raised for a single hand."""
-        return {
-            finger_name: self.is_finger_raised(hand_landmark, joints)
-            for finger_name, joints in self.FINGER_LANDMARKS.items()
-        }
-
-    def is_finger_raised(self, hand_landmark, joints):
-        """Check if a single finger is raised."""
-        y_coords = {
-            key: hand_landmark.landmark[joints[key]].y
-            for key in ["TIP", "DIP", "PIP", "MCP"]
-        }
+        """Return (index_up, middle_up) flags for a single hand."""
+        return (
+            self.is_finger_raised(hand_landmark, self.INDEX_FINGER_CHAIN),
+            self.is_finger_raised(hand_landmark, self.MIDDLE_FINGER_CHAIN),
+        )
+
+    def is_finger_raised(self, hand_landmark, chain):
+        """Check if a single finger is raised, given its joint chain."""
+        tip, dip, pip, mcp = chain
 
+        # The chained comparison stops reading joints at the first failure
+        landmarks = hand_landmark.landmark
         return (
-            y_coords["TIP"]
-            < y_coords["DIP"]
-            < y_coords["PIP"]
-            < y_coords["MCP"]
+            landmarks[tip].y
+            < landmarks[dip].y
+            < landmarks[pip].y
+            < landmarks[mcp].y
         )
 
     def normalize_coordinates(self, landmark, image_shape=None):
@@ -233,12 +295,7 @@ class HandTracker:
 
     def _get_current_finger_states(self, hand):
         """Get the current raised states of index and middle fingers."""
-        index_joints = self.FINGER_LANDMARKS[self.INDEX_FINGER_KEY]
-        middle_joints = self.FINGER_LANDMARKS[self.MIDDLE_FINGER_KEY]
-        return (
-            self.is_finger_raised(hand, index_joints),
-            self.is_finger_raised(hand, middle_joints),
-        )
+        return self.check_hand_fingers(hand)
 
     def _is_click_happening(self, index_up, middle_up):
         """Determine if a click gesture occurred based on finger states."""
@@ -1,3 +1,4 @@
+import logging
 import cv2
 import numpy as np
 from modules.drawing import (
@@ -20,6 +21,8 @@ PEN_SIZE_MAX = 30
 PEN_SIZE_STEP = 5
 OVERLAY_ALPHA = 0.5
 SHAPE_BUTTON_ALPHA = 0.4
+UI_TILE_SIZE = 64
+HIT_GRID_CELL = 64
 
 # Text Constants
 FONT = cv2.FONT_HERSHEY_SIMPLEX
@@ -27,52 +30,197 @@ TEXT_SCALE = 0.6
 TEXT_THICKNESS = 1
 LABEL_MARGIN = 10
 LABEL_OFFSET_Y = 25
+LABEL_TILE_PADDING = 2
+
+logger = logging.getLogger(__name__)
 
 
 class CircleButton:
     """Represents a circular UI button."""
 
+    # Label tiles shared by buttons with the same text
+    label_tiles = {}
+
     def __init__(
         self, center_x, center_y, radius, color, label="", is_pen=False
     ):
         self.center_x = center_x
         self.center_y = center_y
         self.radius = radius
+        self.radius_squared = radius * radius
         self.color = color
         self.label = label
         self.is_pen = is_pen
         self.alpha = OVERLAY_ALPHA
 
-    def draw(self, frame):
-        """Draw the button on the frame."""
-        overlay = frame.copy()
-        center = (self.center_x, self.center_y)
+        self.label_mask = None
+        if label:
+            self.create_label_tile()
+
+    def create_label_tile(self):
+        """Place the label's coverage tile below the circle.
+
+        Rendering the UI layer reads this mask, so putText runs once per
+        distinct label.
+        """
+        tile = self.label_tiles.get(self.label)
+        if tile is None:
+            tile = self.rasterize_label()
+            self.label_tiles[self.label] = tile
+
+        text_width, text_height = tile[0]
+        self.label_mask = tile[1]
+
+        text_x = self.center_x - text_width // 2
+        text_y = self.center_y + self.radius + text_height + LABEL_MARGIN
+        self.label_origin = (
+            text_x - LABEL_TILE_PADDING,
+            text_y - text_height - LABEL_TILE_PADDING,
+        )
+
+    def rasterize_label(self):
+        """Return the label's text size and coverage tile.
 
-        cv2.circle(overlay, center, self.radius, self.color, -1)
-        cv2.addWeighted(overlay, self.alpha, frame, 1 - self.alpha, 0, frame)
-
-        if self.label:
-            text_size = cv2.getTextSize(
-                self.label, FONT, TEXT_SCALE, TEXT_THICKNESS
-            )[0]
-            text_x = self.center_x - text_size[0] // 2
-            text_y = self.center_y + self.radius + text_size[1] + LABEL_MARGIN
-
-            cv2.putText(
-                frame,
-                self.label,
-                (text_x, text_y),
-                FONT,
-                TEXT_SCALE,
-                WHITE,
-                TEXT_THICKNESS,
+        The tile depends only on the text, not on the button's position.
+        """
+        (text_width, text_height), baseline = cv2.getTextSize(
+            self.label, FONT, TEXT_SCALE, TEXT_THICKNESS
+        )
+
+        # Pad the text box so stroke thickness and anti-aliasing fit
+        width = text_width + 2 * LABEL_TILE_PADDING + 1
+        height = text_height + baseline + 2 * LABEL_TILE_PADDING + 1
+
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.putText(
+            mask,
+            self.label,
+            (LABEL_TILE_PADDING, text_height + LABEL_TILE_PADDING),
+            FONT,
+            TEXT_SCALE,
+            255,
+            TEXT_THICKNESS,
+        )
+        return (text_width, text_height), mask
+
+    def render(self, image, alpha, labels):
+        """Render the button into a UI layer image, alpha and label planes."""
+        self.draw_disc(image)
+        self.draw_disc(alpha, round(self.alpha * 255))
+
+        regions = self.get_label_regions(labels.shape)
+        if regions is not None:
+            frame_region, tile_region = regions
+            cv2.max(
+                labels[frame_region],
+                self.label_mask[tile_region],
+                dst=labels[frame_region],
             )
 
+    def draw_disc(self, image, color=None):
+        """Draw the filled button circle, without transparency."""
+        center = (self.center_x, self.center_y)
+        color = self.color if color is None else color
+        cv2.circle(image, center, self.radius, color, -1)
+
+    def get_label_regions(self, frame_shape):
+        """Return the label tile's frame and tile slices, clipped to frame.
+
+        Returns None when there is no label or it lies outside the frame.
+        """
+        if self.label_mask is None:
+            return None
+
+        left, top = self.label_origin
+        height, width = self.label_mask.shape
+        x0, y0 = max(left, 0), max(top, 0)
+        x1 = min(left + width, frame_shape[1])
+        y1 = min(top + height, frame_shape[0])
+
+        if x0 >= x1 or y0 >= y1:
+            return None
+
+        frame_region = (slice(y0, y1), slice(x0, x1))
+        tile_region = (
+            slice(y0 - top, y1 - top),
+            slice(x0 - left, x1 - left),
+        )
+        return frame_region, tile_region
+
     def is_over(self, x, y):
         """Check if point (x,y) is inside the button."""
-        return (x - self.center_x) ** 2 + (
-            y - self.center_y
-        ) ** 2 < self.radius**2
+        # Points outside the bounding square are rejected without squaring
+        dx = x - self.center_x
+        if dx > self.radius or dx < -self.radius:
+            return False
+
+        dy = y - self.center_y
+        if dy > self.radius or dy < -self.radius:
+            return False
+
+        return dx * dx + dy * dy < self.radius_squared
+
+
+class UILayer:
+    """A pre-rendered UI image blended onto frames with per-pixel alpha."""
+
+    def __init__(self, image, alpha):
+        # Only the bounding box of the drawn UI is blended. When the box
+        # is mostly empty, as with the top row plus the pen size column,
+        # it is split into tiles and the empty ones are dropped
+        x, y, width, height = cv2.boundingRect(alpha)
+        regions = self.find_tile_regions(alpha, x, y, width, height)
+        tiled_area = sum(
+            (rows.stop - rows.start) * (cols.stop - cols.start)
+            for rows, cols in regions
+        )
+        if tiled_area * 2 > width * height:
+            regions = [(slice(y, y + height), slice(x, x + width))]
+
+        self.tiles = [
+            self.create_tile(image, alpha, region) for region in regions
+        ]
+
+    def find_tile_regions(self, alpha, x, y, width, height):
+        """Return the tiles of the bounding box that hold any UI pixels."""
+        regions = []
+        for top in range(y, y + height, UI_TILE_SIZE):
+            bottom = min(top + UI_TILE_SIZE, y + height)
+            for left in range(x, x + width, UI_TILE_SIZE):
+                right = min(left + UI_TILE_SIZE, x + width)
+                region = (slice(top, bottom), slice(left, right))
+                if alpha[region].any():
+                    regions.append(region)
+        return regions
+
+    def create_tile(self, image, alpha, region):
+        """Precompute a tile's integer planes for composite.
+
+        A tile blends as frame * (255 - a) / 255 + image * a / 255; fully
+        opaque tiles store no inverse alpha and are copied instead.
+        """
+        tile_alpha = cv2.merge([alpha[region]] * 3)
+        premultiplied = cv2.multiply(image[region], tile_alpha, scale=1 / 255)
+
+        inverse_alpha = None
+        if tile_alpha.min() < 255:
+            inverse_alpha = 255 - tile_alpha
+
+        return region, premultiplied, inverse_alpha
+
+    def composite(self, frame):
+        """Blend the layer onto the frame in place."""
+        for region, premultiplied, inverse_alpha in self.tiles:
+            frame_region = frame[region]
+
+            if inverse_alpha is None:
+                frame_region[...] = premultiplied
+                continue
+
+            cv2.multiply(
+                frame_region, inverse_alpha, dst=frame_region, scale=1 / 255
+            )
+            cv2.add(frame_region, premultiplied, dst=frame_region)
 
 
 class Menu:
@@ -100,6 +248,9 @@ class Menu:
         self.clear_button = None
         self.current_hover = None
 
+        # Rendered UI layers keyed by frame shape and visible menus
+        self.ui_layers = {}
+
         self.create_buttons()
 
     def create_buttons(self):
@@ -109,6 +260,7 @@ class Menu:
         self.create_shape_buttons()
         self.create_clear_button()
         self.create_toggle_buttons()
+        self.create_hit_grid()
 
     def create_color_buttons(self):
         """Create color selection buttons."""
@@ -153,6 +305,9 @@ class Menu:
             )
         ]
 
+        for button in self.shape_buttons:
+            button.alpha = SHAPE_BUTTON_ALPHA
+
     def create_clear_button(self):
         """Create clear canvas button."""
         self.clear_button = CircleButton(
@@ -173,76 +328,85 @@ class Menu:
             *self.eraser_button_pos, TOGGLE_RADIUS, LIGHT_GRAY, "Eraser"
         )
 
+    def create_hit_grid(self):
+        """Bucket buttons by the grid cells their bounding squares touch."""
+        self.hit_grid = {}
+        for button in self.get_all_buttons():
+            left = (button.center_x - button.radius) // HIT_GRID_CELL
+            right = (button.center_x + button.radius) // HIT_GRID_CELL
+            top = (button.center_y - button.radius) // HIT_GRID_CELL
+            bottom = (button.center_y + button.radius) // HIT_GRID_CELL
+
+            # Cells keep get_all_buttons order, so the first hit still wins
+            for cell_x in range(left, right + 1):
+                for cell_y in range(top, bottom + 1):
+                    cell = self.hit_grid.setdefault((cell_x, cell_y), [])
+                    cell.append(button)
+
     def draw_ui(self, app, frame):
         """Draw the entire UI on the frame."""
+        key = (frame.shape, *self.get_ui_state(app))
+
+        layer = self.ui_layers.get(key)
+        if layer is None:
+            layer = self.render_ui_layer(app, frame.shape)
+            self.ui_layers[key] = layer
+
+        layer.composite(frame)
+
+    def get_ui_state(self, app):
+        """Return the app flags that decide which buttons are visible."""
+        return (
+            app.show_canvas,
+            app.show_canvas and app.show_colors,
+            app.show_canvas and app.show_brush_sizes,
+        )
+
+    def render_ui_layer(self, app, frame_shape):
+        """Render the buttons visible in the current UI state once."""
+        height, width = frame_shape[:2]
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        alpha = np.zeros((height, width), dtype=np.uint8)
+        labels = np.zeros((height, width), dtype=np.uint8)
 
-        self.board_toggle.draw(frame)
+        buttons = [self.board_toggle]
 
         # Draw buttons if visible
         if app.show_canvas:
-            print("Drawing canvas buttons")
-            self.clear_button.draw(frame)
-            self.pen_toggle.draw(frame)
-            self.color_toggle.draw(frame)
-            self.eraser_toggle.draw(frame)
+            logger.debug("Rendering canvas buttons")
+            buttons += [
+                self.clear_button,
+                self.pen_toggle,
+                self.color_toggle,
+                self.eraser_toggle,
+            ]
 
             if app.show_colors:
-                print("Drawing color buttons")
-                for button in self.color_buttons:
-                    button.draw(frame)
-
-            if app.show_brush_sizes:
-                print("Drawing pen size buttons")
-                for button in self.pen_size_buttons:
-                    # Draw white outline for pen size buttons
-                    cv2.circle(
-                        frame,
-                        (button.center_x, button.center_y),
-                        button.radius + 4,
-                        WHITE,
-                        -1,
-                    )
-                    cv2.circle(
-                        frame,
-                        (button.center_x, button.center_y),
-                        button.radius,
-                        button.color,
-                        -1,
-                    )
-
-            for button in self.shape_buttons:
-                button.alpha = SHAPE_BUTTON_ALPHA
-                button.draw(frame)
-
-    def draw(self, frame):
-        """Draw the button on the frame."""
-        # Create overlay for transparency effect
-        overlay = frame.copy()
-        center = (self.center_x, self.center_y)
+                logger.debug("Rendering color buttons")
+                buttons += self.color_buttons
 
-        # Draw button
-        cv2.circle(overlay, center, self.radius, self.color, -1)
-
-        # Apply transparency
-        cv2.addWeighted(overlay, self.alpha, frame, 1 - self.alpha, 0, frame)
-
-        # Draw label if exists
-        if self.label:
-            text_size = cv2.getTextSize(
-                self.label, FONT, TEXT_SCALE, TEXT_THICKNESS
-            )[0]
-            text_x = self.center_x - text_size[0] // 2
-            text_y = self.center_y + self.radius + text_size[1] + LABEL_MARGIN
-
-            cv2.putText(
-                frame,
-                self.label,
-                (text_x, text_y),
-                FONT,
-                TEXT_SCALE,
-                WHITE,
-                TEXT_THICKNESS,
-            )
+            buttons += self.shape_buttons
+
+        for button in buttons:
+            button.render(image, alpha, labels)
+
+        if app.show_canvas and app.show_brush_sizes:
+            logger.debug("Rendering pen size buttons")
+            self.render_pen_size_buttons(image, alpha)
+
+        # Labels go on top in solid white, faded only by their coverage
+        image[labels > 0] = WHITE
+        cv2.max(alpha, labels, dst=alpha)
+
+        return UILayer(image, alpha)
+
+    def render_pen_size_buttons(self, image, alpha):
+        """Render the opaque pen size buttons with a white outline."""
+        for button in self.pen_size_buttons:
+            center = (button.center_x, button.center_y)
+            cv2.circle(image, center, button.radius + 4, WHITE, -1)
+            cv2.circle(image, center, button.radius, button.color, -1)
+            cv2.circle(alpha, center, button.radius + 4, 255, -1)
 
     def handle_interaction(self, finger_pos, is_clicking):
         """Handle button interactions."""
@@ -250,8 +414,17 @@ class Menu:
             self.current_hover = None
             return None
 
-        for button in self.get_all_buttons():
-            if button.is_over(finger_pos[0], finger_pos[1]):
+        # Buttons never overlap, so a finger still on the hovered button
+        # hits it again without a lookup
+        x, y = finger_pos
+        hover = self.current_hover
+        if hover is not None and hover.is_over(x, y):
+            return hover if is_clicking else None
+
+        # Only the buttons touching the finger's grid cell can be hit
+        cell = (x // HIT_GRID_CELL, y // HIT_GRID_CELL)
+        for button in self.hit_grid.get(cell, ()):
+            if button.is_over(x, y):
                 self.current_hover = button
                 return button if is_clicking else None
 